@@ -189,8 +189,11 @@ export async function extractDocumentDate(
   filePath: string,
   config: ServerConfig,
 ): Promise<string> {
-  const scannerMatch = originalName.match(/(\d{4}-\d{2}-\d{2})/);
-  if (scannerMatch) return scannerMatch[1];
+  // Cheap pre-check: a YYYY-MM-DD stamp needs at least 10 chars and a dash
+  if (originalName.length >= 10 && originalName.includes("-")) {
+    const scannerMatch = originalName.match(/(\d{4}-\d{2}-\d{2})/);
+    if (scannerMatch) return scannerMatch[1];
+  }
 
   const textStart = text.slice(0, 1000);
   const allDates: string[] = [];
@@ -18,6 +18,8 @@ import type { ServerConfig } from "./config.js";
 const require = createRequire(import.meta.url);
 const execAsync = util.promisify(exec);
 
+const OCR_TMP_BASE = path.join(os.homedir(), ".mcp_tmp");
+
 // --- Lazy-loaded optional dependencies ---
 function loadPdfParse(): any | null {
   try { return require("pdf-parse"); }
@@ -37,10 +39,9 @@ function loadAdmZip(): any | null {
 // --- OCR Helpers ---
 
 async function performOCR(filePath: string, isPdf: boolean, config: ServerConfig): Promise<string> {
-  const tmpBase = path.join(os.homedir(), ".mcp_tmp");
-  if (!fs.existsSync(tmpBase)) fs.mkdirSync(tmpBase, { recursive: true });
+  fs.mkdirSync(OCR_TMP_BASE, { recursive: true });
 
-  const tmpDir = path.join(tmpBase, `ocr_${Date.now()}_${Math.random().toString(36).slice(2, 7)}`);
+  const tmpDir = path.join(OCR_TMP_BASE, `ocr_${Date.now()}_${Math.random().toString(36).slice(2, 7)}`);
   fs.mkdirSync(tmpDir, { recursive: true });
 
   try {
@@ -106,7 +107,10 @@ function extractWithTextutil(filePath: string): string | null {
 // --- Apple IWA (Protobuf) extraction for Pages ---
 
 function extractTextFromIWA(data: Buffer): string {
-  let raw = Buffer.alloc(0);
+  // Collect frame views and concatenate once — growing one buffer per frame
+  // copies everything read so far and leaves a garbage buffer each time
+  const chunks: Buffer[] = [];
+  let raw: Buffer;
   let pos = 0;
   try {
     while (pos < data.length) {
@@ -115,9 +119,10 @@ function extractTextFromIWA(data: Buffer): string {
       const len = data[pos] | (data[pos + 1] << 8) | (data[pos + 2] << 16);
       pos += 3;
       if (pos + len > data.length) break;
-      raw = Buffer.concat([raw, data.subarray(pos, pos + len)]);
+      chunks.push(data.subarray(pos, pos + len));
       pos += len;
     }
+    raw = Buffer.concat(chunks);
   } catch {
     raw = Buffer.from(data);
   }
@@ -55,6 +55,8 @@ export function trimPath(p: string): string {
  */
 export function fixICloudPath(inputPath: string): string {
   if (!inputPath) return inputPath;
+  // Both patterns below need this substring — skip the regex passes for ordinary paths
+  if (!inputPath.includes("Mobile Documents/comapple")) return inputPath;
   // Fix the most common pattern: "comappleCloudDocs" → "com~apple~CloudDocs"
   let fixed = inputPath.replace(
     /Mobile Documents\/comappleCloudDocs/g,
@@ -104,10 +106,13 @@ export function validateFilePath(filePath: string): { valid: boolean; error?: st
   if (abs !== path.normalize(abs)) {
     return { valid: false, error: "Path traversal detected" };
   }
-  if (!fs.existsSync(abs)) {
+  // A single lstat doubles as the existence check (ENOTDIR, EACCES, … count as missing)
+  let stats: fs.Stats;
+  try {
+    stats = fs.lstatSync(abs);
+  } catch {
     return { valid: false, error: "File not found" };
   }
-  const stats = fs.lstatSync(abs);
   if (stats.isSymbolicLink()) {
     return { valid: false, error: "Symbolic links are not allowed" };
   }
@@ -132,10 +137,13 @@ export function validateDirPath(dirPath: string): { valid: boolean; error?: stri
     return { valid: false, error: "No directory path provided" };
   }
   const abs = path.resolve(dirPath);
-  if (!fs.existsSync(abs)) {
+  let stats: fs.Stats;
+  try {
+    stats = fs.statSync(abs);
+  } catch {
     return { valid: false, error: `Directory not found: ${abs}` };
   }
-  if (!fs.statSync(abs).isDirectory()) {
+  if (!stats.isDirectory()) {
     return { valid: false, error: "Path is not a directory" };
   }
   return { valid: true };
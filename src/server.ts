@@ -49,6 +49,21 @@ import { recordOperation, undoLastBatch, getUndoStats } from "./undo.js";
 
 const config = loadConfig();
 
+// Skip noisy directories that slow down find_folder
+const SKIP_DIRS = new Set([
+  "node_modules", ".git", ".Trash", ".cache", ".npm", ".local",
+  "Caches", "Logs", "Preferences", "Saved Application State",
+  "Application Support", "Containers", "Group Containers",
+  "Developer", "WebKit",
+]);
+// Always traverse these even inside Library (iCloud lives here)
+const ALLOW_DIRS = new Set(["Mobile Documents"]);
+
+// Documents analyzed in parallel by analyze_folder (OCR subprocesses, AI requests)
+const ANALYZE_CONCURRENCY = 4;
+// Stats in flight for scan_directory listOnly — enough to keep libuv's pool busy
+const STAT_CONCURRENCY = 16;
+
 // ─── Helpers ────────────────────────────────────────────────────────────────
 
 /** Normalize incoming paths: trim → expand ~ → fix iCloud → Unicode NFC */
@@ -65,52 +80,113 @@ function fileHash(filePath: string): string {
   }
 }
 
-function collectFiles(
+/**
+ * Append an entry name to a normalized directory path. Cheaper than
+ * path.join() in directory-walk loops, which re-normalizes the whole path.
+ * Mirrors path.join() for a "." root, which yields bare entry names.
+ */
+function childPath(dir: string, name: string): string {
+  if (dir === "." || dir === "." + path.sep) return name;
+  return dir.endsWith(path.sep) ? dir + name : dir + path.sep + name;
+}
+
+/** Lazily yield supported files under dir, so callers can stop early. */
+function* walkFiles(
   dir: string,
   recursive: boolean,
   fileTypes?: string[],
   keywords?: string[],
   maxDepth = 10,
-  depth = 0,
-): string[] {
-  if (depth > maxDepth) {
-    console.error(`[collectFiles] maxDepth ${maxDepth} reached at: ${dir}`);
-    return [];
-  }
-  const results: string[] = [];
+): Generator<string> {
+  // Normalize filters once instead of per scanned file; the fileTypes filter is
+  // folded into the supported-extension set so each file needs a single lookup
+  const typeSet = fileTypes?.length ? new Set(fileTypes.map((t) => "." + t.toLowerCase())) : null;
+  const allowedExts = typeSet
+    ? new Set([...SUPPORTED_EXTENSIONS].filter((ext) => typeSet.has(ext)))
+    : SUPPORTED_EXTENSIONS;
+  const lowerKeywords = keywords?.length ? keywords.map((k) => k.toLowerCase()) : null;
+  // Explicit DFS stack of open listings — same visiting order as recursion,
+  // without a call frame and intermediate array per directory
+  const stack: Array<{ dir: string; entries: fs.Dirent[]; next: number }> = [];
+  // Skipped subdirectories are tallied and reported once, not logged one by one
+  let tooDeep = 0;
+  let unreadable = 0;
+
+  const enter = (d: string): void => {
+    const depth = stack.length;
+    if (depth > maxDepth) {
+      tooDeep++;
+      return;
+    }
+    try {
+      // Dirent carries the entry type from readdir — no per-entry stat() needed
+      const entries = fs.readdirSync(d, { withFileTypes: true });
+      if (depth === 0) {
+        console.error(`[collectFiles] Scanning: ${d} (${entries.length} entries, recursive=${recursive})`);
+      }
+      stack.push({ dir: d, entries, next: 0 });
+    } catch (e: any) {
+      if (depth === 0) console.error(`[collectFiles] Cannot read directory ${d}: ${e.message}`);
+      else unreadable++;
+    }
+  };
 
   try {
-    const items = fs.readdirSync(dir);
-    if (depth === 0) {
-      console.error(`[collectFiles] Scanning: ${dir} (${items.length} entries, recursive=${recursive})`);
-    }
-    for (const item of items) {
+    enter(path.normalize(dir));
+    while (stack.length > 0) {
+      const top = stack[stack.length - 1];
+      if (top.next >= top.entries.length) {
+        stack.pop();
+        continue;
+      }
+      const entry = top.entries[top.next++];
+      const item = entry.name;
       if (item.startsWith(".")) continue;
-      const full = path.join(dir, item);
-
-      try {
-        const st = fs.statSync(full);
-        if (st.isDirectory() && recursive) {
-          results.push(...collectFiles(full, true, fileTypes, keywords, maxDepth, depth + 1));
-        } else if (st.isFile()) {
-          const ext = path.extname(item).toLowerCase();
-          if (fileTypes?.length && !fileTypes.includes(ext.slice(1))) continue;
-          if (!SUPPORTED_EXTENSIONS.has(ext)) continue;
-          if (keywords?.length && !keywords.some((k) => item.toLowerCase().includes(k.toLowerCase()))) continue;
-          results.push(full);
+      const full = childPath(top.dir, item);
+
+      if (entry.isDirectory()) {
+        if (recursive) enter(full);
+      } else if (entry.isFile()) {
+        const ext = path.extname(item).toLowerCase();
+        if (!allowedExts.has(ext)) continue;
+        if (lowerKeywords) {
+          const lowerItem = item.toLowerCase();
+          if (!lowerKeywords.some((k) => lowerItem.includes(k))) continue;
         }
-      } catch (e: any) {
-        console.error(`[collectFiles] Error accessing ${full}: ${e.message}`);
-        continue;
+        yield full;
       }
     }
-  } catch (e: any) {
-    console.error(`[collectFiles] Cannot read directory ${dir}: ${e.message}`);
+  } finally {
+    // Also runs when the caller stops iterating early
+    if (tooDeep || unreadable) {
+      console.error(`[collectFiles] Skipped ${tooDeep} directories beyond maxDepth ${maxDepth}, ${unreadable} unreadable`);
+    }
   }
+}
 
-  if (depth === 0) {
-    console.error(`[collectFiles] Found ${results.length} supported files`);
-  }
+function collectFiles(
+  dir: string,
+  recursive: boolean,
+  fileTypes?: string[],
+  keywords?: string[],
+  maxDepth = 10,
+): string[] {
+  const results = [...walkFiles(dir, recursive, fileTypes, keywords, maxDepth)];
+  console.error(`[collectFiles] Found ${results.length} supported files`);
+  return results;
+}
+
+/** Map items through fn with at most `limit` calls in flight; results keep input order. */
+async function mapConcurrent<T, R>(items: T[], limit: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const i = next++;
+      results[i] = await fn(items[i]);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
   return results;
 }
 
@@ -379,11 +455,12 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
 
         console.error(`[scan_directory] totalFiles=${totalFiles}, returning ${files.length} (offset=${offset}, limit=${effectiveLimit})`);
 
-        // Fast list-only mode: return filenames, paths, sizes — no text extraction
+        // Fast list-only mode: return filenames, paths, sizes — no text extraction.
+        // Stats run with bounded concurrency so they overlap on libuv's thread pool.
         if (listOnly) {
-          const listing = files.map((f) => {
+          const listing = await mapConcurrent(files, STAT_CONCURRENCY, async (f) => {
             try {
-              const st = fs.statSync(f);
+              const st = await fs.promises.stat(f);
               return {
                 filename: path.basename(f),
                 path: f,
@@ -478,15 +555,20 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const hashes: Record<string, string[]> = {};
         const errors: Array<{ file: string; error: string }> = [];
 
-        for (let i = 0; i < files.length; i++) {
+        type Outcome = { file: string; hash: string; analysis?: Record<string, any>; error?: string };
+        const outcomes = await mapConcurrent(files, ANALYZE_CONCURRENCY, async (f): Promise<Outcome> => {
+          const hash = fileHash(f);
           try {
-            const hash = fileHash(files[i]);
-            if (hash) (hashes[hash] ??= []).push(files[i]);
-            const analysis = await analyzeDocument(files[i]);
-            results.push({ originalPath: files[i], fileHash: hash, ...analysis });
+            return { file: f, hash, analysis: await analyzeDocument(f) };
           } catch (e: any) {
-            errors.push({ file: path.basename(files[i]), error: e.message });
+            return { file: f, hash, error: e.message };
           }
+        });
+
+        for (const o of outcomes) {
+          if (o.hash) (hashes[o.hash] ??= []).push(o.file);
+          if (o.analysis) results.push({ originalPath: o.file, fileHash: o.hash, ...o.analysis });
+          else errors.push({ file: path.basename(o.file), error: o.error! });
         }
 
         const elapsed = Date.now() - start;
@@ -532,7 +614,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const src = normPath(a.filePath);
         const targetDir = normPath(a.targetDirectory);
         if (!fs.existsSync(src)) return err("Source file not found");
-        if (!fs.existsSync(targetDir)) fs.mkdirSync(targetDir, { recursive: true });
+        fs.mkdirSync(targetDir, { recursive: true });
 
         const fname = path.basename(src);
         const target = safeRenamePath(targetDir, fname, fname);
@@ -580,52 +662,51 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const matches: Array<{ path: string; score: number }> = [];
         let exactMatch: string | null = null;
 
-        // Skip noisy directories that slow down search
-        const SKIP_DIRS = new Set([
-          "node_modules", ".git", ".Trash", ".cache", ".npm", ".local",
-          "Caches", "Logs", "Preferences", "Saved Application State",
-          "Application Support", "Containers", "Group Containers",
-          "Developer", "WebKit",
-        ]);
-        // Always traverse these even inside Library (iCloud lives here)
-        const ALLOW_DIRS = new Set(["Mobile Documents"]);
-
         // Dynamic Levenshtein threshold: scale with search term length
         const maxLev = Math.max(1, Math.min(3, Math.floor(search.length / 3)));
 
         function walk(dir: string, depth: number) {
           if (depth > 6 || exactMatch) return;
+          const inLibrary = path.basename(dir) === "Library";
+          let items: string[];
           try {
-            for (const item of fs.readdirSync(dir)) {
-              if (item.startsWith(".")) continue;
-              if (SKIP_DIRS.has(item) && !ALLOW_DIRS.has(item)) continue;
-              const full = path.join(dir, item);
-              try {
-                if (!fs.statSync(full).isDirectory()) continue;
-              } catch { continue; }
-
-              // Inside Library, only enter Mobile Documents
-              if (path.basename(dir) === "Library" && !ALLOW_DIRS.has(item)) continue;
-
-              const lower = item.toLowerCase();
-              if (lower === search) {
-                matches.push({ path: full, score: 0 });
-                exactMatch = full;
-                return; // exact match found, stop
-              }
-              if (lower.includes(search)) {
-                matches.push({ path: full, score: 1 });
-              } else if (search.includes(lower)) {
-                matches.push({ path: full, score: 2 });
-              } else {
-                const d = levenshtein(search, lower);
-                if (d <= maxLev) matches.push({ path: full, score: d + 10 });
-              }
-              walk(full, depth + 1);
+            items = fs.readdirSync(dir);
+          } catch {
+            return; // skip unreadable dirs
+          }
+
+          for (const item of items) {
+            if (item.startsWith(".")) continue;
+            if (SKIP_DIRS.has(item) && !ALLOW_DIRS.has(item)) continue;
+            // Inside Library, only enter Mobile Documents
+            if (inLibrary && !ALLOW_DIRS.has(item)) continue;
+            const full = childPath(dir, item);
+            try {
+              if (!fs.statSync(full).isDirectory()) continue;
+            } catch { continue; }
+
+            const lower = item.toLowerCase();
+            if (lower === search) {
+              matches.push({ path: full, score: 0 });
+              exactMatch = full;
+              return; // exact match found, stop
             }
-          } catch { /* skip unreadable dirs */ }
+            if (lower.includes(search)) {
+              matches.push({ path: full, score: 1 });
+            } else if (search.includes(lower)) {
+              matches.push({ path: full, score: 2 });
+            } else {
+              const d = levenshtein(search, lower);
+              if (d <= maxLev) matches.push({ path: full, score: d + 10 });
+            }
+            walk(full, depth + 1);
+            // Unwind as soon as a descendant found the exact match; remaining
+            // siblings are neither stat-ed nor scored, so no further partial
+            // matches are collected once the exact match is known
+            if (exactMatch) return;
+          }
         }
-        walk(basePath, 0);
+        walk(path.normalize(basePath), 0);
         matches.sort((x, y) => x.score - y.score);
 
         // Deduplicate and limit results
@@ -662,6 +743,8 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const results = [];
         const errors = [];
         let foldersCreated = 0;
+        // Operations usually share a handful of target folders — create each one only once
+        const readyDirs = new Set<string>();
 
         if (mode === "move") {
           const backupPath = path.join(baseFolder, `.backup_${Date.now()}.json`);
@@ -677,7 +760,11 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
           try {
             const targetDir = path.join(baseFolder, op.targetFolder);
             const targetPath = path.join(targetDir, op.newFilename);
-            if (!fs.existsSync(targetDir)) { fs.mkdirSync(targetDir, { recursive: true }); foldersCreated++; }
+            if (!readyDirs.has(targetDir)) {
+              // mkdirSync returns the first directory it created, or undefined if it already existed
+              if (fs.mkdirSync(targetDir, { recursive: true })) foldersCreated++;
+              readyDirs.add(targetDir);
+            }
             if (!fs.existsSync(op.originalPath)) { errors.push({ op, error: "Source not found" }); continue; }
             if (fs.existsSync(targetPath)) { errors.push({ op, error: "Target exists" }); continue; }
 
@@ -737,7 +824,12 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const v = validateDirPath(dlPath);
         if (!v.valid) return err(v.error!);
 
-        const files = collectFiles(dlPath, false).slice(0, maxFiles);
+        // Stream the listing and stop at maxFiles instead of collecting the whole folder
+        const files: string[] = [];
+        for (const f of walkFiles(dlPath, false)) {
+          if (files.length >= maxFiles) break;
+          files.push(f);
+        }
         if (files.length === 0) return ok({ scanned: 0, message: "No supported documents found" });
 
         const suggestions = [];
@@ -786,19 +878,19 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         if (!docs?.length) return err("No documents provided");
 
         if (fmt === "csv") {
-          let csv = "Filename,Path,Date,References,Keywords,Type\n";
+          const lines = ["Filename,Path,Date,References,Keywords,Type"];
           for (const d of docs) {
             if (d.error) continue;
-            csv += [
+            lines.push([
               d.originalFilename || "",
               d.originalPath || "",
               d.documentDate || "",
               (d.references || []).join(";"),
               (d.keywords || []).join(";"),
               d.documentType || "",
-            ].map((f) => `"${String(f).replace(/"/g, '""')}"`).join(",") + "\n";
+            ].map((f) => `"${String(f).replace(/"/g, '""')}"`).join(","));
           }
-          return ok(csv);
+          return ok(lines.join("\n") + "\n");
         }
         return ok(docs);
       }